@@ -16,8 +16,10 @@ This hook is executed to launch the applications.
 
 import os
 import sys
+import shlex
 import subprocess
 import platform
+import time
 import tank
 
 
@@ -31,6 +33,83 @@ ENGINES = {
     'tk-unreal' : 'unreal'
 }
 
+# Department records looked up per user id, as (timestamp, record) pairs,
+# so repeated launches in the same session don't hit the Shotgun server.
+_DEPT_CACHE = {}
+_DEPT_CACHE_TTL = 60
+
+# The platform never changes while the launcher is running, resolve it once.
+_SYSTEM = platform.system()
+_IS_WIN = sys.platform.startswith("win")
+_IS_MAC = sys.platform == "darwin"
+
+_HOOK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _build_linux(app_path, app_args):
+    """
+    Build the command used to launch an application on Linux.
+
+    :param app_path: (str) The path of the application executable
+    :param app_args: (str) Any arguments the application may require
+    :returns: A (command, Popen keyword arguments) tuple
+    """
+    # on linux, we just run the executable directly
+    return [app_path] + shlex.split(app_args), {"start_new_session": True}
+
+
+def _build_mac(app_path, app_args):
+    """
+    Build the command used to launch an application on macOS.
+
+    :param app_path: (str) The path of the application executable or bundle
+    :param app_args: (str) Any arguments the application may require
+    :returns: A (command, Popen keyword arguments) tuple
+    """
+    # We have two possibilities: we can be asked to launch an application
+    # bundle using the "open" command, or we might have been given an
+    # executable that we need to treat like any other Unix-style command.
+    # The best way we have to know whether we're in one situation or the
+    # other is to check the app path we're being asked to launch; if it's a
+    # .app, we use the "open" command, and if it's not then we treat it like
+    # a typical, Unix executable.
+    if not app_path.endswith(".app"):
+        return _build_linux(app_path, app_args)
+
+    # The -n flag tells the OS to launch a new instance even if one is
+    # already running. The -a flag specifies that the path is an
+    # application and supports both the app bundle form or the full
+    # executable form.
+    cmd = ["open", "-n", "-a", app_path]
+    if app_args:
+        cmd += ["--args"] + shlex.split(app_args)
+    return cmd, {}
+
+
+def _build_win(app_path, app_args):
+    """
+    Build the command used to launch an application on Windows.
+
+    :param app_path: (str) The path of the application executable
+    :param app_args: (str) Any arguments the application may require
+    :returns: A (command, Popen keyword arguments) tuple
+    """
+    # on windows, we detach the process from the launcher in order to
+    # avoid any command shells popping up as part of the application
+    # launch. The arguments are passed through as a single command line
+    # so Windows paths and quoting are left untouched.
+    cmd = '"%s" %s' % (app_path, app_args)
+    flags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    return cmd, {"creationflags": flags}
+
+
+if _IS_WIN:
+    _BUILD_CMD = _build_win
+elif _IS_MAC:
+    _BUILD_CMD = _build_mac
+else:
+    _BUILD_CMD = _build_linux
+
 
 
 class AppLaunch(tank.Hook):
@@ -56,14 +135,14 @@ class AppLaunch(tank.Hook):
         :returns: (dict) The two valid keys are 'command' (str) and 'return_code' (int).
         """
 
-        system = platform.system()
+        system = _SYSTEM
 
-        app_name = ENGINES[engine_name]
+        app_name = ENGINES.get(engine_name)
         context = self.tank.context_from_path(self.tank.project_path)
         sg = self.tank.shotgun
         project = context.project
         user = context.user
-        depart = sg.find_one("Department", [['users', 'in', user]], ['name'])
+        depart = get_department(sg, user)
 
         depart_confirm = False
 
@@ -74,31 +153,18 @@ class AppLaunch(tank.Hook):
             self.parent.log_debug("No department found for user: %s" % user)
 
         if sys.version_info.major == 3 and app_name == 'unreal' and system == 'Windows':
-            now_dir = os.path.dirname(os.path.abspath(__file__))
-            packages = os.path.join(now_dir, 'packages', 'win')
+            packages = os.path.join(_HOOK_DIR, 'packages', 'win')
 
-            sys.path.append(packages)
+            if packages not in sys.path:
+                sys.path.append(packages)
 
-            external_paths = [
+            add_ue_python_paths([
                 "external_path3",
                 packages
-            ]
-            
-            new_paths = os.pathsep.join(external_paths)
-            
-            if 'UE_PYTHONPATH' in os.environ:
-                os.environ['UE_PYTHONPATH'] += os.pathsep + new_paths
-            else:
-                os.environ['UE_PYTHONPATH'] = new_paths
+            ])
         # Add directory with init_unreal.py to UE_PYTHONPATH before running the app
         if app_name == 'unreal':
-            current_dir = os.path.abspath(os.path.dirname(__file__))
-            unreal_python_dir = os.path.join(current_dir, "unreal_launch")
-            
-            if 'UE_PYTHONPATH' in os.environ:
-                os.environ['UE_PYTHONPATH'] += os.pathsep + unreal_python_dir
-            else:
-                os.environ['UE_PYTHONPATH'] = unreal_python_dir
+            add_ue_python_paths([os.path.join(_HOOK_DIR, "unreal_launch")])
 
             self.parent.log_debug("UNREAL ENGINE will be launched at WINDOWS OS")
             self.parent.log_debug("HOOKS_UNREAL_LAUNCH Updated Unreal Python paths:")
@@ -106,9 +172,9 @@ class AppLaunch(tank.Hook):
             self.parent.log_debug("sys.path: %s" % sys.path)
 
 
-        if depart_confirm:
+        if depart_confirm and app_name:
             
-            adapter = get_adapter(platform.system())
+            adapter = get_adapter(system)
             packages = get_rez_packages(sg, app_name, version, system, project)
 
             try:
@@ -136,39 +202,62 @@ class AppLaunch(tank.Hook):
             return adapter.execute(context, app_args, app_name)
 
         else:
-            if tank.util.is_linux():
-                # on linux, we just run the executable directly
-                cmd = "%s %s &" % (app_path, app_args)
-
-            elif tank.util.is_macos():
-                # If we're on OS X, then we have two possibilities: we can be asked
-                # to launch an application bundle using the "open" command, or we
-                # might have been given an executable that we need to treat like
-                # any other Unix-style command. The best way we have to know whether
-                # we're in one situation or the other is to check the app path we're
-                # being asked to launch; if it's a .app, we use the "open" command,
-                # and if it's not then we treat it like a typical, Unix executable.
-                if app_path.endswith(".app"):
-                    # The -n flag tells the OS to launch a new instance even if one is
-                    # already running. The -a flag specifies that the path is an
-                    # application and supports both the app bundle form or the full
-                    # executable form.
-                    cmd = 'open -n -a "%s"' % (app_path)
-                    if app_args:
-                        cmd += " --args %s" % app_args
-                else:
-                    cmd = "%s %s &" % (app_path, app_args)
-
-            else:
-                # on windows, we run the start command in order to avoid
-                # any command shells popping up as part of the application launch.
-
-                cmd = 'start /B "App" "%s" %s' % (app_path, app_args) # Original
-
-            # run the command to launch the app
-            exit_code = os.system(cmd)
-
-            return {"command": cmd, "return_code": exit_code}
+            cmd, popen_kwargs = _BUILD_CMD(app_path, app_args or "")
+
+            # run the command to launch the app, without waiting for it
+            return_code = 0
+            try:
+                subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    close_fds=True,
+                    **popen_kwargs
+                )
+            except OSError as e:
+                # report the failure through the return code so the launcher
+                # shows its launch error, as a failed command used to
+                self.logger.error("Failed to launch %s: %s" % (app_path, e))
+                return_code = e.errno or 1
+
+            if not isinstance(cmd, str):
+                cmd = " ".join(cmd)
+
+            return {"command": cmd, "return_code": return_code}
+
+def add_ue_python_paths(paths):
+    """
+    Append the given paths to the UE_PYTHONPATH environment variable, skipping
+    the ones which were already added by a previous launch.
+
+    :param paths: (list) Paths to add
+    """
+    current = os.environ.get('UE_PYTHONPATH')
+    existing = current.split(os.pathsep) if current else []
+    new_paths = [path for path in paths if path not in existing]
+    if new_paths:
+        os.environ['UE_PYTHONPATH'] = os.pathsep.join(existing + new_paths)
+
+def get_department(sg, user):
+    """
+    Return the Department record the given user belongs to, using a short
+    lived cache keyed on the user id.
+
+    :param sg: Shotgun API instance
+    :param user: (dict) User entity dictionary
+    :returns: (dict) Department record with its name, or None
+    """
+    if not user:
+        return None
+
+    now = time.monotonic()
+    cached = _DEPT_CACHE.get(user['id'])
+    if cached and now - cached[0] < _DEPT_CACHE_TTL:
+        return cached[1]
+
+    depart = sg.find_one("Department", [['users', 'in', user]], ['name'])
+    _DEPT_CACHE[user['id']] = (now, depart)
+    return depart
 
 def get_rez_packages(sg, app_name, version, system, project):
     
@@ -215,7 +304,7 @@ def get_rez_packages(sg, app_name, version, system, project):
 
 def get_adapter(system=''):
     if not system:
-        system = platform.system()
+        system = _SYSTEM
     
     options = {
         'Linux' : LinuxAdapter,
@@ -265,7 +354,7 @@ class BaseAdapter:
         if args:
             command += ' {args}'.format(args=args)
         
-        if platform.system() == 'Linux':
+        if _SYSTEM == 'Linux':
             command = "mate-terminal -x bash -c '{}' &".format(command)
         else:
             command = "start /B 'App' '{}'".format(command)
@@ -14,6 +14,9 @@ import re
 
 HookBaseClass = sgtk.get_hook_baseclass()
 
+# The default Shotgun versioning number (of the form '.v001')
+_VERSION_RE = re.compile(r'.v[0-9]{3}')
+
 
 class UnrealActions(HookBaseClass):
 
@@ -202,7 +205,7 @@ Functions to import FBX into Unreal
 def _sanitize_name(name):
     
     # Remove the default Shotgun versioning number if found (of the form '.v001')
-    name_no_version = re.sub(r'.v[0-9]{3}', '', name)
+    name_no_version = _VERSION_RE.sub('', name)
 
     # Replace any remaining '.' with '_' since they are not allowed in Unreal asset names
     return name_no_version.replace('.', '_')
@@ -7,6 +7,7 @@
 
 import copy
 import os
+import shutil
 import tempfile
 import uuid
 
@@ -15,6 +16,10 @@ from tank_vendor import yaml
 
 HookBaseClass = sgtk.get_hook_baseclass()
 
+# use the libyaml based dumper when it is available, it is a lot faster than the
+# pure python one on big publish trees
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 class PostPhase(HookBaseClass):
     """
@@ -52,14 +57,6 @@ class PostPhase(HookBaseClass):
         # Manage background publishing process
         # ------------------------------------------------------------------------
 
-        monitor_data = {
-            "items": [],
-            "session_name": publish_tree.root_item.properties.get("session_name", ""),
-        }
-
-        current_engine = sgtk.platform.current_engine()
-        bg_publish_app = current_engine.apps.get("tk-multi-bg-publish")
-
         bg_processing = publish_tree.root_item.properties.get("bg_processing")
         in_bg_process = publish_tree.root_item.properties.get("in_bg_process")
 
@@ -68,72 +65,54 @@ class PostPhase(HookBaseClass):
         if not bg_processing or in_bg_process:
             return
 
-        # modify the publish tree in order to add a new property/setting on the fly in order to give
-        # the item/task a unique identifier
-        # this will be very useful to track the tasks progress on the monitor side
-        # we can't rely on names here as some items/tasks can have the same name
-        # at the same time, start to build the monitor tree
-        for item in publish_tree:
-
-            # if the item has a thumbnail, download it and make sure we can access it later in the bg process
-            thumbnail_path = item.get_thumbnail_as_path()
-            if thumbnail_path:
-                item._thumbnail_path = thumbnail_path
-
-            item_uuid = str(uuid.uuid4())
-            item_data = {
-                "name": item.name,
-                "uuid": item_uuid,
-                "status": bg_publish_app.constants.WAITING_TO_START,
-                "tasks": [],
-                "is_parent_root": item.parent.is_root,
-            }
-
-            for task in item.tasks:
-                if task.active:
-
-                    # as we can't create a PublishSetting object using the Publish API, convert the task to a dict then
-                    # add the new setting to finally reset the task from the dict
-                    uuid_setting = {
-                        "name": "Task UUID",
-                        "type": "str",
-                        "default_value": None,
-                        "description": "UUID of the current task",
-                        "value": str(uuid.uuid4()),
-                    }
-                    dummy_task_dict = task.to_dict()
-                    dummy_task_dict["settings"]["Task UUID"] = uuid_setting
-                    dummy_task = task.from_dict(dummy_task_dict, None)
-                    task.settings["Task UUID"] = dummy_task.settings["Task UUID"]
-
-                    item_data["tasks"].append(
-                        {
-                            "name": task.name,
-                            "uuid": uuid_setting["value"],
-                            "status": bg_publish_app.constants.WAITING_TO_START,
-                        }
-                    )
-
-            if item_data["tasks"]:
-                item.properties.uuid = item_uuid
-                monitor_data["items"].append(item_data)
+        current_engine = sgtk.platform.current_engine()
+        bg_publish_app = current_engine.apps.get("tk-multi-bg-publish")
 
         # get the path to the folder where all the files used by the background publishing process will be stored
         root_folder_path = os.path.join(
             bg_publish_app.cache_location, current_engine.name
         )
-        if not os.path.exists(root_folder_path):
-            os.makedirs(root_folder_path)
+        os.makedirs(root_folder_path, exist_ok=True)
         tmp_folder_path = tempfile.mkdtemp(dir=root_folder_path)
 
         # build the path to these files
-        self.__TREE_FILE_PATH = os.path.join(tmp_folder_path, "publish_tree.yml")
+        tree_file_path = os.path.join(tmp_folder_path, "publish_tree.yml")
         monitor_file_path = os.path.join(tmp_folder_path, "monitor.yml")
 
-        # finally, save the publish tree and the monitor data to the files
-        publish_tree.save_file(self.__TREE_FILE_PATH)
-        with open(monitor_file_path, "w+") as fp:
-            yaml.safe_dump(monitor_data, fp)
+        # save the monitor data, streaming the items to the file while walking the
+        # publish tree. The file is only renamed to its final name once the
+        # publish tree has been saved too.
+        # if anything goes wrong, don't leave a partial publish in the cache
+        # folder as the monitor would pick it up
+        session_name = publish_tree.root_item.properties.get("session_name", "")
+        try:
+            with open(monitor_file_path + ".part", "w+") as fp:
+                # block style is required, the items list is appended below
+                yaml.dump(
+                    {"session_name": session_name},
+                    fp,
+                    Dumper=_YAML_DUMPER,
+                    default_flow_style=False,
+                )
+                fp.write("items:")
+                has_items = False
+                for item_data in self._walk_monitor_items(publish_tree, bg_publish_app):
+                    if not has_items:
+                        fp.write("\n")
+                        has_items = True
+                    yaml.dump(
+                        [item_data], fp, Dumper=_YAML_DUMPER, default_flow_style=False
+                    )
+                if not has_items:
+                    fp.write(" []\n")
+
+            # finally, save the publish tree
+            publish_tree.save_file(tree_file_path)
+            os.replace(monitor_file_path + ".part", monitor_file_path)
+        except Exception:
+            shutil.rmtree(tmp_folder_path, ignore_errors=True)
+            raise
+        self.__TREE_FILE_PATH = tree_file_path
 
         self.logger.info(
             "Background Publish files have been saved on disk.",
@@ -178,3 +157,72 @@ class PostPhase(HookBaseClass):
             # launch the background publishing process and show the monitor app
             bg_publish_app.launch_publish_process(self.__TREE_FILE_PATH)
             bg_publish_app.create_panel()
+
+    def _walk_monitor_items(self, publish_tree, bg_publish_app):
+        """
+        Walk the publish tree to give each item and active task a unique identifier and yield the monitor data of
+        all the items with active tasks.
+
+        :param publish_tree: The :ref:`publish-api-tree` instance representing
+            the items to be published.
+        :param bg_publish_app: The background publish app instance.
+        """
+
+        # modify the publish tree in order to add a new property/setting on the fly in order to give
+        # the item/task a unique identifier
+        # this will be very useful to track the tasks progress on the monitor side
+        # we can't rely on names here as some items/tasks can have the same name
+        # at the same time, build the monitor tree
+        reference_setting = None
+        uuid4 = uuid.uuid4
+        for item in publish_tree:
+
+            # if the item has a thumbnail, download it and make sure we can access it later in the bg process
+            thumbnail_path = item.get_thumbnail_as_path()
+            if thumbnail_path:
+                item._thumbnail_path = thumbnail_path
+
+            item_uuid = str(uuid4())
+            item_data = {
+                "name": item.name,
+                "uuid": item_uuid,
+                "status": bg_publish_app.constants.WAITING_TO_START,
+                "tasks": [],
+                "is_parent_root": item.parent.is_root,
+            }
+
+            for task in item.tasks:
+                if task.active:
+
+                    # as we can't create a PublishSetting object using the Publish API, convert the first task to
+                    # a dict then add the new setting to finally reset the task from the dict. The resulting setting
+                    # is then copied over for all the other tasks.
+                    if reference_setting is None:
+                        uuid_setting = {
+                            "name": "Task UUID",
+                            "type": "str",
+                            "default_value": None,
+                            "description": "UUID of the current task",
+                            "value": None,
+                        }
+                        dummy_task_dict = task.to_dict()
+                        dummy_task_dict["settings"]["Task UUID"] = uuid_setting
+                        dummy_task = task.from_dict(dummy_task_dict, None)
+                        reference_setting = dummy_task.settings["Task UUID"]
+
+                    task_uuid = str(uuid4())
+                    uuid_setting = copy.copy(reference_setting)
+                    uuid_setting.value = task_uuid
+                    task.settings["Task UUID"] = uuid_setting
+
+                    item_data["tasks"].append(
+                        {
+                            "name": task.name,
+                            "uuid": task_uuid,
+                            "status": bg_publish_app.constants.WAITING_TO_START,
+                        }
+                    )
+
+            if item_data["tasks"]:
+                item.properties.uuid = item_uuid
+                yield item_data
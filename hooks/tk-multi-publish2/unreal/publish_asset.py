@@ -5,7 +5,6 @@
 import sgtk
 import os
 import sys
-import unreal
 import datetime
 
 
@@ -17,6 +16,10 @@ _OS_LOCAL_STORAGE_PATH_FIELD = {
     "linux2": "linux_path",
 }[sys.platform]
 
+# accept() results, the publisher only reads them so they can be shared.
+_ACCEPTED = {"accepted": True, "checked": True}
+_REJECTED = {"accepted": False, "checked": True}
+
 
 HookBaseClass = sgtk.get_hook_baseclass()
 class UnrealAssetPublishPlugin(HookBaseClass):
@@ -34,7 +37,21 @@ class UnrealAssetPublishPlugin(HookBaseClass):
     """
     def __init__(self, *args, **kwargs):
         super(UnrealAssetPublishPlugin, self).__init__(*args, **kwargs)
-            
+        # (item, FBX export task, previous FBX modification time) tuples built
+        # during the publish pass, keyed by item id, exported in a single batch
+        # when the first item is finalized.
+        self._pending_exports = {}
+        # Destination folders already ensured during the publish pass.
+        self._ensured_folders = set()
+        # Publish date fields, shared by all the items of the publish session,
+        # and the ids of the items validated during that session.
+        self._date_fields = None
+        self._validated_items = set()
+        # Templates resolved by this plugin, keyed by template name.
+        self._templates = {}
+        # SG utils framework settings manager, loaded on first use.
+        self._settings_manager = None
+
     # NOTE: The plugin icon and name are defined by the base file plugin.
 
     @property
@@ -131,19 +148,22 @@ class UnrealAssetPublishPlugin(HookBaseClass):
 
         # Unreal setttings
         settings_frame.unreal_publish_folder_label = QtGui.QLabel("Publish folder:")
-        storage_roots = self.parent.shotgun.find(
-            "LocalStorage",
-            [],
-            ["code", _OS_LOCAL_STORAGE_PATH_FIELD]
-        )
+        storage_roots = self._get_storage_roots()
         settings_frame.storage_roots_widget = QtGui.QComboBox()
         settings_frame.storage_roots_widget.addItem("Current Unreal Project")
+        # Combobox index of each storage root path, used to restore the saved
+        # publish folder without scanning the combobox entries.
+        settings_frame.storage_roots_indexes = {}
         for storage_root in storage_roots:
-            if storage_root[_OS_LOCAL_STORAGE_PATH_FIELD]:
+            storage_path = storage_root[_OS_LOCAL_STORAGE_PATH_FIELD]
+            if storage_path:
+                settings_frame.storage_roots_indexes.setdefault(
+                    storage_path, settings_frame.storage_roots_widget.count()
+                )
                 settings_frame.storage_roots_widget.addItem(
                     "%s (%s)" % (
                         storage_root["code"],
-                        storage_root[_OS_LOCAL_STORAGE_PATH_FIELD]
+                        storage_path
                     ),
                     userData=storage_root,
                 )
@@ -189,9 +209,6 @@ class UnrealAssetPublishPlugin(HookBaseClass):
         :param settings: A list of dictionaries.
         :raises NotImplementedError: if editing multiple items.
         """
-        # defer Qt-related imports
-        from sgtk.platform.qt import QtCore
-
         self.logger.info("Setting UI settings")
         if len(settings) > 1:
             # We do not allow editing multiple items
@@ -199,20 +216,15 @@ class UnrealAssetPublishPlugin(HookBaseClass):
         cur_settings = settings[0]
         # Note: the template is validated in the accept method, no need to check it here.
         publish_template_setting = cur_settings.get("Publish Template")
-        publisher = self.parent
-        publish_template = publisher.get_template_by_name(publish_template_setting)
+        publish_template = self._get_template(publish_template_setting)
         if isinstance(publish_template, sgtk.TemplatePath):
             widget.unreal_publish_folder_label.setEnabled(False)
             widget.storage_roots_widget.setEnabled(False)
         folder_index = 0
         publish_folder = cur_settings["Publish Folder"]
         if publish_folder:
-            for i in range(widget.storage_roots_widget.count()):
-                data = widget.storage_roots_widget.itemData(i, role=QtCore.Qt.UserRole)
-                if data and data[_OS_LOCAL_STORAGE_PATH_FIELD] == publish_folder:
-                    folder_index = i
-                    break
-            self.logger.debug("Index for %s is %s" % (publish_folder, folder_index))
+            folder_index = widget.storage_roots_indexes.get(publish_folder, 0)
+            self.logger.debug("Index for %s is %s", publish_folder, folder_index)
         widget.storage_roots_widget.setCurrentIndex(folder_index)
 
     def load_saved_ui_settings(self, settings):
@@ -222,10 +234,7 @@ class UnrealAssetPublishPlugin(HookBaseClass):
         :param settings: A dictionary where keys are settings names and
                          values Settings instances.
         """
-        # Retrieve SG utils framework settings module and instantiate a manager
-        fw = self.load_framework("tk-framework-shotgunutils_v5.x.x")
-        module = fw.import_module("settings")
-        settings_manager = module.UserSettings(self.parent)
+        settings_manager = self._get_settings_manager()
 
         # Retrieve saved settings
         settings["Publish Folder"].value = settings_manager.retrieve(
@@ -233,7 +242,7 @@ class UnrealAssetPublishPlugin(HookBaseClass):
             settings["Publish Folder"].value,
             settings_manager.SCOPE_PROJECT
         )
-        self.logger.debug("Loaded settings %s" % settings["Publish Folder"])
+        self.logger.debug("Loaded settings %s", settings["Publish Folder"])
 
     def save_ui_settings(self, settings):
         """
@@ -241,10 +250,7 @@ class UnrealAssetPublishPlugin(HookBaseClass):
 
         :param settings: A dictionary of Settings instances.
         """
-        # Retrieve SG utils framework settings module and instantiate a manager
-        fw = self.load_framework("tk-framework-shotgunutils_v5.x.x")
-        module = fw.import_module("settings")
-        settings_manager = module.UserSettings(self.parent)
+        settings_manager = self._get_settings_manager()
 
         # Save settings
         publish_folder = settings["Publish Folder"].value
@@ -276,28 +282,23 @@ class UnrealAssetPublishPlugin(HookBaseClass):
         :returns: dictionary with boolean keys accepted, required and enabled
         """
 
-        accepted = True
-        publisher = self.parent
-
         # ensure the publish template is defined
         publish_template_setting = settings.get("Publish Template")
-        publish_template = publisher.get_template_by_name(publish_template_setting.value)
+        publish_template = self._get_template(publish_template_setting.value)
         if not publish_template:
             self.logger.debug(
                 "A publish template could not be determined for the "
                 "asset item. Not accepting the item."
             )
-            accepted = False
+            # No need to load the saved settings for a rejected item
+            return _REJECTED
 
         # we've validated the work and publish templates. add them to the item properties
         # for use in subsequent methods
         item.properties["publish_template"] = publish_template
 
         self.load_saved_ui_settings(settings)
-        return {
-            "accepted": accepted,
-            "checked": True
-        }
+        return _ACCEPTED
 
     def validate(self, settings, item):
         """
@@ -336,14 +337,8 @@ class UnrealAssetPublishPlugin(HookBaseClass):
 
         publish_template = item.properties["publish_template"]
 
-        # Add the Unreal asset name to the fields
-        fields = {"name": asset_name}
-
-        # Add today's date to the fields
-        date = datetime.date.today()
-        fields["YYYY"] = date.year
-        fields["MM"] = date.month
-        fields["DD"] = date.day
+        # Add the Unreal asset name to today's date fields
+        fields = dict(self._get_date_fields(item), name=asset_name)
 
         # Stash the Unrea asset path and name in properties
         item.properties["asset_path"] = asset_path
@@ -351,12 +346,17 @@ class UnrealAssetPublishPlugin(HookBaseClass):
 
         # Get destination path for exported FBX from publish template
         # which should be project root + publish template
+        # The path is only normalized once: os.path.abspath already does it
+        # for relative paths.
         publish_path = publish_template.apply_fields(fields)
-        publish_path = os.path.normpath(publish_path)
-        if not os.path.isabs(publish_path):
+        if os.path.isabs(publish_path):
+            publish_path = os.path.normpath(publish_path)
+        else:
             # If the path is not absolute, prepend the publish folder setting.
             publish_folder = settings["Publish Folder"].value
             if not publish_folder:
+                # defer Unreal imports
+                import unreal
                 publish_folder = unreal.Paths.project_saved_dir()
             publish_path = os.path.abspath(
                 os.path.join(
@@ -398,23 +398,37 @@ class UnrealAssetPublishPlugin(HookBaseClass):
         # get the path in a normalized state. no trailing separator, separators
         # are appropriate for current os, no double separators, etc.
 
+        # A new publish session starts with its first published item, or when
+        # an item is published again after a session which didn't reach the
+        # finalize pass. Drop any export or ensured folder left over.
+        if not self._pending_exports or id(item) in self._pending_exports:
+            self._pending_exports = {}
+            self._ensured_folders = set()
+
         # Ensure that the destination path exists before exporting since the
-        # Unreal FBX exporter doesn't check that
-        destination_path = item.properties["destination_path"]
-        self.parent.ensure_folder_exists(destination_path)
-
-        # Export the asset from Unreal
-        asset_path = item.properties["asset_path"]
-        asset_name = item.properties["asset_name"]
-        try:
-            _unreal_export_asset_to_fbx(destination_path, asset_path, asset_name)
-        except Exception:
-            self.logger.debug("Asset %s cannot be exported to FBX." % (asset_path))
-
-        # let the base class register the publish
-        # the publish_file will copy the file from the work path to the publish path
-        # if the item is provided with the worK_template and publish_template properties
-        super(UnrealAssetPublishPlugin, self).publish(settings, item)
+        # Unreal FBX exporter doesn't check that. Sibling assets are often
+        # published to the same folder, so only ensure it once, and skip the
+        # Toolkit call entirely when the folder is already there.
+        properties = item.properties
+        destination_path = properties["destination_path"]
+        if destination_path not in self._ensured_folders:
+            if not os.path.isdir(destination_path):
+                self.parent.ensure_folder_exists(destination_path)
+            self._ensured_folders.add(destination_path)
+
+        # Queue the asset FBX export, all the queued assets are exported from
+        # Unreal in a single batch during the finalize pass.
+        asset_path = properties["asset_path"]
+        asset_name = properties["asset_name"]
+        task = _generate_fbx_export_task(properties["publish_path"], asset_path, asset_name)
+        if not task:
+            raise RuntimeError("Asset %s cannot be exported to FBX." % asset_path)
+        # An FBX left over from an earlier publish must not be mistaken for
+        # the result of this export
+        self._pending_exports[id(item)] = (item, task, _get_file_mtime(task.filename))
+
+        # The publish is only registered in the finalize pass, once the FBX
+        # file was actually exported
 
     def finalize(self, settings, item):
         """
@@ -426,53 +440,151 @@ class UnrealAssetPublishPlugin(HookBaseClass):
             instances.
         :param item: Item to process
         """
+        # Export all the assets queued during the publish pass
+        if self._pending_exports:
+            pending_exports = list(self._pending_exports.values())
+            self._pending_exports = {}
+            # The publish session is over, the next one gets its own date
+            self._date_fields = None
+            _unreal_export_assets_to_fbx([task for _, task, _ in pending_exports])
+            # Only keep the export errors on the items, so the tasks and the
+            # assets they reference can be released
+            for pending_item, task, previous_mtime in pending_exports:
+                pending_item.properties["fbx_export_errors"] = _get_export_task_errors(
+                    task, previous_mtime
+                )
+
+        # The batch result doesn't tell which tasks failed, only fail this
+        # item if its own task reported errors or didn't write its FBX file
+        errors = item.properties["fbx_export_errors"]
+        if errors:
+            for error_msg in errors:
+                self.logger.error(error_msg)
+            raise RuntimeError(
+                "Failed to export %s to FBX %s." % (item.properties["asset_path"], item.properties["publish_path"])
+            )
+
+        # let the base class register the publish now that the FBX exists
+        # the publish_file will copy the file from the work path to the publish path
+        # if the item is provided with the worK_template and publish_template properties
+        super(UnrealAssetPublishPlugin, self).publish(settings, item)
+
         # do the base class finalization
         super(UnrealAssetPublishPlugin, self).finalize(settings, item)
 
+    def _get_date_fields(self, item):
+        """
+        Return the date fields of the current publish session, computed when
+        its first item is validated. Validating an item again starts a new
+        session, e.g. when the publisher was left open.
+
+        :param item: The item being validated.
+        :returns: A dictionary with the YYYY, MM and DD template fields.
+        """
+        if self._date_fields is None or id(item) in self._validated_items:
+            today = datetime.date.today()
+            self._date_fields = {"YYYY": today.year, "MM": today.month, "DD": today.day}
+            self._validated_items = set()
+        self._validated_items.add(id(item))
+        return self._date_fields
+
+    def _get_settings_manager(self):
+        """
+        Return the SG utils framework settings manager, loading the framework
+        the first time it is needed.
 
-def _unreal_export_asset_to_fbx(destination_path, asset_path, asset_name):
+        :returns: A ``UserSettings`` instance.
+        """
+        if self._settings_manager is None:
+            # Retrieve SG utils framework settings module and instantiate a manager
+            fw = self.load_framework("tk-framework-shotgunutils_v5.x.x")
+            module = fw.import_module("settings")
+            self._settings_manager = module.UserSettings(self.parent)
+        return self._settings_manager
+
+    def _get_template(self, template_name):
+        """
+        Return the template with the given name, resolving it only once per
+        plugin instance.
+
+        :param str template_name: The name of the template to retrieve.
+        :returns: A :class:`sgtk.Template` instance or None.
+        """
+        if template_name not in self._templates:
+            self._templates[template_name] = self.parent.get_template_by_name(template_name)
+        return self._templates[template_name]
+
+
+def _unreal_export_assets_to_fbx(tasks):
     """
-    Export an asset to FBX from Unreal
+    Export assets to FBX from Unreal in a single batch
 
-    :param destination_path: The path where the exported FBX will be placed
-    :param asset_path: The Unreal asset to export to FBX
-    :param asset_name: The asset name to use for the FBX filename
+    The batch result doesn't tell which tasks failed, the errors of each task
+    are available from the task itself once the batch has run.
+
+    :param tasks: A list of AssetExportTask to run
+    :returns: True if the whole batch was exported, False otherwise
     """
-    # Get an export task
-    task = _generate_fbx_export_task(destination_path, asset_path, asset_name)
-    if not task:
-        return False, None
+    # defer Unreal imports
+    import unreal
 
     # Do the FBX export
-    result = unreal.Exporter.run_asset_export_task(task)
+    return unreal.Exporter.run_asset_export_tasks(tasks)
+
 
-    if not result:
-        unreal.log_error("Failed to export {}".format(task.filename))
-        for error_msg in task.errors:
-            unreal.log_error("{}".format(error_msg))
+def _get_export_task_errors(task, previous_mtime):
+    """
+    Return the errors of an FBX export task which was run.
 
-        return result, None
+    :param task: The AssetExportTask which was run
+    :param previous_mtime: The modification time of the FBX file before the
+                           export, None if it didn't exist
+    :returns: A list of error messages, empty if the FBX file was exported
+    """
+    errors = [str(error_msg) for error_msg in task.errors]
+    if not errors:
+        mtime = _get_file_mtime(task.filename)
+        if mtime is None or (previous_mtime is not None and mtime <= previous_mtime):
+            errors = ["FBX file %s was not written by the export." % task.filename]
+    return errors
 
-    return result, task.filename
 
+def _get_file_mtime(path):
+    """
+    Return the modification time of the given file.
 
-def _generate_fbx_export_task(destination_path, asset_path, asset_name):
+    :param path: The path of the file
+    :returns: The modification time, or None if the file doesn't exist
+    """
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _generate_fbx_export_task(filename, asset_path, asset_name):
     """
     Create and configure an Unreal AssetExportTask
 
-    :param destination_path: The path where the exported FBX will be placed
+    :param filename: The full path of the FBX file to export to
     :param asset_path: The Unreal asset to export to FBX
-    :param asset_name: The FBX filename to export to
+    :param asset_name: The asset name, used for error reporting
     :return the configured AssetExportTask
     """
-    loaded_asset = unreal.EditorAssetLibrary.load_asset(asset_path)
+    # defer Unreal imports
+    import unreal
+
+    # The asset is usually already in memory, e.g. selected in the Content
+    # Browser. Otherwise check the asset registry first, it is a lot
+    # cheaper than trying to load a missing asset
+    loaded_asset = unreal.find_asset(asset_path)
+    if not loaded_asset and unreal.EditorAssetLibrary.does_asset_exist(asset_path):
+        loaded_asset = unreal.EditorAssetLibrary.load_asset(asset_path)
 
     if not loaded_asset:
         unreal.log_error("Failed to create FBX export task for {}: Could not load asset {}".format(asset_name, asset_path))
         return None
 
-    filename = os.path.join(destination_path, asset_name + ".fbx")
-
     # Setup AssetExportTask for non-interactive mode
     task = unreal.AssetExportTask()
     task.object = loaded_asset      # the asset to export
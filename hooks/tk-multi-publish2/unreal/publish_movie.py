@@ -4,15 +4,13 @@
 
 import sgtk
 import unreal
-from tank_vendor import six
 
-import copy
 import datetime
 import os
 import pprint
 import subprocess
 import sys
-import tempfile
+import uuid
 import glob
 # Local storage path field for known Oses.
 _OS_LOCAL_STORAGE_PATH_FIELD = {
@@ -22,6 +20,55 @@ _OS_LOCAL_STORAGE_PATH_FIELD = {
     "linux2": "linux_path",
 }[sys.platform]
 
+# Bootstrap environment variables which must not be passed to the render
+# processes, otherwise they would start their own Toolkit session.
+_BOOTSTRAP_ENV_VARS = frozenset(["UE_SHOTGUN_BOOTSTRAP", "UE_SHOTGRID_BOOTSTRAP"])
+
+# Console variables used by the Movie Render Queue renders, for the best
+# quality output.
+_RENDER_DPCVARS = ",".join([
+    "sg.ViewDistanceQuality=4",
+    "sg.AntiAliasingQuality=4",
+    "sg.ShadowQuality=4",
+    "sg.PostProcessQuality=4",
+    "sg.TextureQuality=4",
+    "sg.EffectsQuality=4",
+    "sg.FoliageQuality=4",
+    "sg.ShadingQuality=4",
+    "r.TextureStreaming=0",
+    "r.ForceLOD=0",
+    "r.SkeletalMeshLODBias=-10",
+    "r.ParticleLODBias=-10",
+    "foliage.DitheredLOD=0",
+    "foliage.ForceLOD=0",
+    "r.Shadow.DistanceScale=10",
+    "r.ShadowQuality=5",
+    "r.Shadow.RadiusThreshold=0.001000",
+    "r.ViewDistanceScale=50",
+    "r.D3D12.GPUTimeout=0",
+    "a.URO.Enable=0",
+])
+
+# Movie Render Queue command line arguments which don't depend on the render.
+_RENDER_QUEUE_ARGS = (
+    "MoviePipelineEntryMap?game=/Script/MovieRenderPipelineCore.MoviePipelineGameMode",
+    "-game",
+    "-Multiprocess",
+    "-NoLoadingScreen",
+    "-NoSplash",
+    "-Renderoffscreen",
+    "-FixedSeed",
+    "-log",
+    "-Unattended",
+    "-messaging",
+    '-SessionName="Publish2 Movie Render"',
+    "-nohmd",
+    "-ResX=1280",
+    "-ResY=720",
+    "-dpcvars=%s" % _RENDER_DPCVARS,
+    "-execcmds=r.HLOD 0",
+)
+
 HookBaseClass = sgtk.get_hook_baseclass()
 class UnrealMoviePublishPlugin(HookBaseClass):
     """
@@ -38,6 +85,25 @@ class UnrealMoviePublishPlugin(HookBaseClass):
     """
     def __init__(self, *args, **kwargs):
         super(UnrealMoviePublishPlugin, self).__init__(*args, **kwargs)
+        # Shotgun sequence entity of each shot, keyed by shot id.
+        self._shot_sequences = {}
+        # Templates resolved by this plugin, keyed by template name.
+        self._templates = {}
+        # Movie render preset names, keyed by presets folder path.
+        self._render_presets = {}
+        # SG utils framework settings manager, loaded on first use.
+        self._settings_manager = None
+        # Issue message format of Movie Render Queue settings, keyed by type.
+        self._render_setting_issues = {}
+        # Unreal project file and Saved folder prefix, resolved on first use.
+        self._project_paths = None
+        # Context template fields, keyed by context id and template name.
+        self._context_fields = {}
+        # Publish date fields, shared by all the items of the publish session,
+        # and the ids of the items validated during that session.
+        self._date_fields = None
+        self._validated_items = set()
+
     # NOTE: The plugin icon and name are defined by the base file plugin.
 
     @property
@@ -112,23 +178,27 @@ class UnrealMoviePublishPlugin(HookBaseClass):
         settings_frame.unreal_render_presets_widget = QtGui.QComboBox()
         settings_frame.unreal_render_presets_widget.addItem("No presets")
         presets_folder = unreal.MovieRenderPipelineProjectSettings().preset_save_dir
-        for preset in unreal.EditorAssetLibrary.list_assets(presets_folder.path):
-            settings_frame.unreal_render_presets_widget.addItem(preset.split(".")[0])
+        settings_frame.unreal_render_presets_widget.addItems(
+            self._get_render_presets(presets_folder.path)
+        )
 
         settings_frame.unreal_publish_folder_label = QtGui.QLabel("Publish folder:")
-        storage_roots = self.parent.shotgun.find(
-            "LocalStorage",
-            [],
-            ["code", _OS_LOCAL_STORAGE_PATH_FIELD]
-        )
+        storage_roots = self._get_storage_roots()
         settings_frame.storage_roots_widget = QtGui.QComboBox()
         settings_frame.storage_roots_widget.addItem("Current Unreal Project")
+        # Combobox index of each storage root path, used to restore the saved
+        # publish folder without scanning the combobox entries.
+        settings_frame.storage_roots_indexes = {}
         for storage_root in storage_roots:
-            if storage_root[_OS_LOCAL_STORAGE_PATH_FIELD]:
+            storage_path = storage_root[_OS_LOCAL_STORAGE_PATH_FIELD]
+            if storage_path:
+                settings_frame.storage_roots_indexes.setdefault(
+                    storage_path, settings_frame.storage_roots_widget.count()
+                )
                 settings_frame.storage_roots_widget.addItem(
                     "%s (%s)" % (
                         storage_root["code"],
-                        storage_root[_OS_LOCAL_STORAGE_PATH_FIELD]
+                        storage_path
                     ),
                     userData=storage_root,
                 )
@@ -159,7 +229,7 @@ class UnrealMoviePublishPlugin(HookBaseClass):
         # settings which are editable in the UI.
         render_presets_path = None
         if widget.unreal_render_presets_widget.currentIndex() > 0:  # First entry is "No Presets"
-            render_presets_path = six.ensure_str(widget.unreal_render_presets_widget.currentText())
+            render_presets_path = widget.unreal_render_presets_widget.currentText()
         storage_index = widget.storage_roots_widget.currentIndex()
         publish_folder = None
         if storage_index > 0:  # Something selected and not the first entry
@@ -180,9 +250,6 @@ class UnrealMoviePublishPlugin(HookBaseClass):
         :param settings: A list of dictionaries.
         :raises NotImplementedError: if editing multiple items.
         """
-        # defer Qt-related imports
-        from sgtk.platform.qt import QtCore
-
         self.logger.info("Setting UI settings")
         if len(settings) > 1:
             # We do not allow editing multiple items
@@ -196,20 +263,15 @@ class UnrealMoviePublishPlugin(HookBaseClass):
         widget.unreal_render_presets_widget.setCurrentIndex(preset_index)
         # Note: the template is validated in the accept method, no need to check it here.
         publish_template_setting = cur_settings.get("Publish Template")
-        publisher = self.parent
-        publish_template = publisher.get_template_by_name(publish_template_setting)
+        publish_template = self._get_template(publish_template_setting)
         if isinstance(publish_template, sgtk.TemplatePath):
             widget.unreal_publish_folder_label.setEnabled(False)
             widget.storage_roots_widget.setEnabled(False)
         folder_index = 0
         publish_folder = cur_settings["Publish Folder"]
         if publish_folder:
-            for i in range(widget.storage_roots_widget.count()):
-                data = widget.storage_roots_widget.itemData(i, role=QtCore.Qt.UserRole)
-                if data and data[_OS_LOCAL_STORAGE_PATH_FIELD] == publish_folder:
-                    folder_index = i
-                    break
-            self.logger.debug("Index for %s is %s" % (publish_folder, folder_index))
+            folder_index = widget.storage_roots_indexes.get(publish_folder, 0)
+            self.logger.debug("Index for %s is %s", publish_folder, folder_index)
         widget.storage_roots_widget.setCurrentIndex(folder_index)
 
     def load_saved_ui_settings(self, settings):
@@ -219,10 +281,7 @@ class UnrealMoviePublishPlugin(HookBaseClass):
         :param settings: A dictionary where keys are settings names and
                          values Settings instances.
         """
-        # Retrieve SG utils framework settings module and instantiate a manager
-        fw = self.load_framework("tk-framework-shotgunutils_v5.x.x")
-        module = fw.import_module("settings")
-        settings_manager = module.UserSettings(self.parent)
+        settings_manager = self._get_settings_manager()
 
         # Retrieve saved settings
         settings["Movie Render Queue Presets Path"].value = settings_manager.retrieve(
@@ -235,8 +294,8 @@ class UnrealMoviePublishPlugin(HookBaseClass):
             settings["Publish Folder"].value,
             settings_manager.SCOPE_PROJECT
         )
-        self.logger.debug("Loaded settings %s" % settings["Publish Folder"])
-        self.logger.debug("Loaded settings %s" % settings["Movie Render Queue Presets Path"])
+        self.logger.debug("Loaded settings %s", settings["Publish Folder"])
+        self.logger.debug("Loaded settings %s", settings["Movie Render Queue Presets Path"])
 
     def save_ui_settings(self, settings):
         """
@@ -244,10 +303,7 @@ class UnrealMoviePublishPlugin(HookBaseClass):
 
         :param settings: A dictionary of Settings instances.
         """
-        # Retrieve SG utils framework settings module and instantiate a manager
-        fw = self.load_framework("tk-framework-shotgunutils_v5.x.x")
-        module = fw.import_module("settings")
-        settings_manager = module.UserSettings(self.parent)
+        settings_manager = self._get_settings_manager()
 
         # Save settings
         render_presets_path = settings["Movie Render Queue Presets Path"].value
@@ -288,7 +344,7 @@ class UnrealMoviePublishPlugin(HookBaseClass):
             self.logger.debug("Edits path not configured.")
             return False
 
-        self.logger.info("Edits path %s" % edits_path)
+        self.logger.info("Edits path %s", edits_path)
         item.properties["unreal_master_sequence"] = edits_path[0]
         item.properties["unreal_shot"] = ".".join([lseq.get_name() for lseq in edits_path[1:]])
         self.logger.info("Master sequence %s, shot %s" % (
@@ -302,11 +358,10 @@ class UnrealMoviePublishPlugin(HookBaseClass):
             return False
         self._render_format = render_format
 
-        publisher = self.parent
         if render_format == "exr":
-            publish_template = publisher.get_template_by_name("unreal.movie_publish_exr")
+            publish_template = self._get_template("unreal.movie_publish_exr")
         else:
-            publish_template = publisher.get_template_by_name("unreal.movie_publish_mov")
+            publish_template = self._get_template("unreal.movie_publish_mov")
 
         if not publish_template:
             self.logger.error("Unable to find a publish template for format: %s" % render_format)
@@ -329,7 +384,9 @@ class UnrealMoviePublishPlugin(HookBaseClass):
                                 "Cannot create folders. Please ensure folders exist.")
                 return False
 
-        fields = context.as_template_fields(publish_template)
+        # Resolve the session date first, the context fields include it
+        self._get_date_fields(item)
+        fields = self._get_context_fields(context, publish_template)
 
         if 'Step' in publish_template.keys:
             if context.step:
@@ -338,17 +395,18 @@ class UnrealMoviePublishPlugin(HookBaseClass):
                 self.logger.error("Context does not have a Step defined, but the template requires it.")
                 return False
 
-        if 'Sequence' in publish_template.keys and context.entity and context.entity["type"] == "Shot":
-            sg = self.parent.shotgun
-            shot_data = sg.find_one("Shot", [["id", "is", context.entity["id"]]], ["sg_sequence"])
-            if shot_data and shot_data["sg_sequence"]:
-                fields["Sequence"] = shot_data["sg_sequence"]["name"]
-                self.logger.info("Retrieved sequence %s from context." % shot_data["sg_sequence"]["name"])
-            else:
-                self.logger.warning("No sequence found for shot %s, but template requires Sequence." % context.entity["name"])
+        entity = context.entity
+        if entity and entity["type"] == "Shot":
+            if 'Sequence' in publish_template.keys:
+                shot_sequence = self._get_shot_sequence(entity["id"])
+                if shot_sequence:
+                    fields["Sequence"] = shot_sequence["name"]
+                    self.logger.info("Retrieved sequence %s from context." % shot_sequence["name"])
+                else:
+                    self.logger.warning("No sequence found for shot %s, but template requires Sequence." % entity["name"])
 
-        if 'Shot' in publish_template.keys and context.entity and context.entity["type"] == "Shot":
-            fields["Shot"] = context.entity["name"]
+            if 'Shot' in publish_template.keys:
+                fields["Shot"] = entity["name"]
 
         unreal_map = unreal.EditorLevelLibrary.get_editor_world()
         unreal_map_path = unreal_map.get_path_name()
@@ -370,11 +428,6 @@ class UnrealMoviePublishPlugin(HookBaseClass):
         version_number = 1
         fields["version"] = version_number
 
-        date = datetime.date.today()
-        fields["YYYY"] = date.year
-        fields["MM"] = date.month
-        fields["DD"] = date.day
-
         sequence = unreal.EditorAssetLibrary.load_asset(asset_path)
         if isinstance(sequence, unreal.LevelSequence):
             playback_range = sequence.get_playback_range()
@@ -386,10 +439,13 @@ class UnrealMoviePublishPlugin(HookBaseClass):
             item.properties["frame_rate"] = fps.numerator
             self.logger.info("Sequence frame range: %d to %d at %d fps" % (start_frame, end_frame, fps.numerator))
 
-        missing_keys = publish_template.missing_keys(fields)
-        if missing_keys:
-            self.logger.error("Missing keys required for the publish template: {}".format(missing_keys))
-            return False
+        # Only let the template work out what is missing, taking optional keys
+        # into account, when some of its keys are not in the fields
+        if not fields.keys() >= publish_template.keys.keys():
+            missing_keys = publish_template.missing_keys(fields)
+            if missing_keys:
+                self.logger.error("Missing keys required for the publish template: {}".format(missing_keys))
+                return False
 
         publish_folder = settings["Publish Folder"].value
         if not publish_folder:
@@ -429,28 +485,157 @@ class UnrealMoviePublishPlugin(HookBaseClass):
         self.save_ui_settings(settings)
         return True
 
+    def _get_date_fields(self, item):
+        """
+        Return the date fields of the current publish session, computed when
+        its first item is validated. Validating an item again starts a new
+        session, e.g. when the publisher was left open.
+
+        :param item: The item being validated.
+        :returns: A dictionary with the YYYY, MM and DD template fields.
+        """
+        if self._date_fields is None or id(item) in self._validated_items:
+            today = datetime.date.today()
+            self._date_fields = {"YYYY": today.year, "MM": today.month, "DD": today.day}
+            self._validated_items = set()
+            # The cached context fields include the previous date
+            self._context_fields = {}
+        self._validated_items.add(id(item))
+        return self._date_fields
+
+    def _get_settings_manager(self):
+        """
+        Return the SG utils framework settings manager, loading the framework
+        the first time it is needed.
+
+        :returns: A ``UserSettings`` instance.
+        """
+        if self._settings_manager is None:
+            # Retrieve SG utils framework settings module and instantiate a manager
+            fw = self.load_framework("tk-framework-shotgunutils_v5.x.x")
+            module = fw.import_module("settings")
+            self._settings_manager = module.UserSettings(self.parent)
+        return self._settings_manager
+
+    def _get_shot_sequence(self, shot_id):
+        """
+        Return the Shotgun sequence the given shot belongs to, only querying
+        Shotgun the first time a shot is requested.
+
+        :param int shot_id: The Shotgun id of the shot.
+        :returns: The sequence entity dictionary or None.
+        """
+        if shot_id not in self._shot_sequences:
+            shot_data = self.parent.shotgun.find_one("Shot", [["id", "is", shot_id]], ["sg_sequence"])
+            self._shot_sequences[shot_id] = shot_data["sg_sequence"] if shot_data else None
+        return self._shot_sequences[shot_id]
+
+    def _get_context_fields(self, context, template):
+        """
+        Return a copy of the template fields for the given context, merged
+        with today's date fields, only resolving them the first time a
+        context and template pair is used.
+
+        :param context: The :class:`sgtk.Context` to get the fields from.
+        :param template: The :class:`sgtk.Template` to get the fields for.
+        :returns: A new dictionary of template fields.
+        """
+        # Contexts are not guaranteed to be hashable, key them on their id and
+        # keep them around to make sure the id was not reused.
+        key = (id(context), template.name)
+        cached = self._context_fields.get(key)
+        if cached is None or cached[0] is not context:
+            fields = context.as_template_fields(template)
+            fields.update(self._date_fields)
+            cached = (context, fields)
+            self._context_fields[key] = cached
+        return dict(cached[1])
+
+    def _get_project_paths(self):
+        """
+        Return the paths of the current Unreal project used by the renders,
+        only querying Unreal for them the first time they are needed.
+
+        :returns: A tuple with the path to the .uproject file and the absolute
+                  path of the project Saved folder, with a trailing separator.
+        """
+        if self._project_paths is None:
+            project_dir = unreal.SystemLibrary.get_project_directory()
+            self._project_paths = (
+                os.path.join(project_dir, "%s.uproject" % unreal.SystemLibrary.get_game_name()),
+                "%s%s" % (os.path.abspath(os.path.join(project_dir, "Saved")), os.path.sep),
+            )
+        return self._project_paths
+
+    def _get_render_presets(self, presets_path):
+        """
+        Return the names of the Movie Render Queue presets saved in the given
+        folder, only listing the folder the first time it is used.
+
+        :param presets_path: The Unreal path of the presets folder.
+        :returns: A list of preset asset paths, without object names.
+        """
+        presets = self._render_presets.get(presets_path)
+        if presets is None:
+            presets = [
+                preset.split(".")[0] for preset in unreal.EditorAssetLibrary.list_assets(presets_path)
+            ]
+            self._render_presets[presets_path] = presets
+        return presets
+
+    def _get_template(self, template_name):
+        """
+        Return the template with the given name, resolving it only once per
+        plugin instance.
+
+        :param str template_name: The name of the template to retrieve.
+        :returns: A :class:`sgtk.Template` instance or None.
+        """
+        if template_name not in self._templates:
+            self._templates[template_name] = self.parent.get_template_by_name(template_name)
+        return self._templates[template_name]
+
     def _check_render_settings(self, render_config):
         """
         Check settings from the given render preset and report which ones are problematic.
         Now we allow both EXR image sequence and Apple ProRes outputs.
         """
         invalid_settings = []
+        for setting in render_config.get_all_settings():
+            issue = self._get_render_setting_issue(type(setting))
+            if issue:
+                invalid_settings.append((setting, issue % setting.get_name()))
+        return invalid_settings
+
+    def _get_render_setting_issue(self, setting_type):
+        """
+        Return the issue caused by render settings of the given type, only
+        checking the type hierarchy the first time a type is seen.
+
+        :param setting_type: A Movie Render Queue setting class.
+        :returns: An issue message format expecting the setting name, or None.
+        """
+        try:
+            return self._render_setting_issues[setting_type]
+        except KeyError:
+            pass
+
         allowed_outputs = (
             unreal.MoviePipelineImageSequenceOutput_EXR,
-            unreal.MoviePipelineAppleProResOutput  
+            unreal.MoviePipelineAppleProResOutput
         )
-
-        for setting in render_config.get_all_settings():
-            if isinstance(setting, unreal.MoviePipelineImagePassBase) and type(setting) != unreal.MoviePipelineDeferredPassBase:
-                invalid_settings.append((setting, "Render pass %s would cause multiple outputs" % setting.get_name()))
-            elif isinstance(setting, unreal.MoviePipelineOutputBase) and not isinstance(setting, allowed_outputs):
-                invalid_settings.append((setting, "Render output %s is not allowed" % setting.get_name()))
-        return invalid_settings
+        issue = None
+        if issubclass(setting_type, unreal.MoviePipelineImagePassBase) and setting_type != unreal.MoviePipelineDeferredPassBase:
+            issue = "Render pass %s would cause multiple outputs"
+        elif issubclass(setting_type, unreal.MoviePipelineOutputBase) and not issubclass(setting_type, allowed_outputs):
+            issue = "Render output %s is not allowed"
+        self._render_setting_issues[setting_type] = issue
+        return issue
 
     def publish(self, settings, item):
-        publish_path = os.path.normpath(item.properties["publish_path"])
-        destination_folder, base_name = os.path.split(publish_path)
-        base_name = os.path.splitext(base_name)[0]
+        # the publish path was already normalized by validate()
+        publish_path = item.properties["publish_path"]
+        base_name = os.path.splitext(os.path.basename(publish_path))[0]
 
         fields = item.properties["fields"]
         version_number = item.properties["version_number"]
@@ -481,15 +666,15 @@ class UnrealMoviePublishPlugin(HookBaseClass):
 
         self._unreal_asset_set_version(item.properties["unreal_asset_path"], version_number)
 
+        output_prefix = os.path.join(output_dir, base_name)
         if self._render_format == "exr":
-            exr_files = sorted([f for f in glob.glob(os.path.join(output_dir, base_name + "_*.exr")) if os.path.isfile(f)])
-            if not exr_files:
+            if not any(os.path.isfile(f) for f in glob.glob(output_prefix + "_*.exr")):
                 raise RuntimeError("No EXR frames found after rendering.")
-            exr_pattern = os.path.join(output_dir, base_name + "%04d.exr")
+            exr_pattern = output_prefix + "%04d.exr"
             item.properties["path"] = exr_pattern
             item.properties["publish_path"] = exr_pattern
         else:
-            mov_files = sorted([f for f in glob.glob(os.path.join(output_dir, base_name + "_*.mov")) if os.path.isfile(f)])
+            mov_files = sorted([f for f in glob.glob(output_prefix + "_*.mov") if os.path.isfile(f)])
             if not mov_files:
                 raise RuntimeError("No MOV file found after rendering.")
             mov_file = mov_files[0]
@@ -508,6 +693,9 @@ class UnrealMoviePublishPlugin(HookBaseClass):
             instances.
         :param item: Item to process
         """
+        # The publish session is over, the next one gets its own date
+        self._date_fields = None
+
         # do the base class finalization
         super(UnrealMoviePublishPlugin, self).finalize(settings, item)
 
@@ -523,7 +711,9 @@ class UnrealMoviePublishPlugin(HookBaseClass):
             return None
 
     def _unreal_asset_get_version(self, asset_path):
-        asset = unreal.EditorAssetLibrary.load_asset(asset_path)
+        # The sequence was already loaded by validate(), only load it if it
+        # is not in memory anymore
+        asset = unreal.find_asset(asset_path) or unreal.EditorAssetLibrary.load_asset(asset_path)
         version_number = 0
 
         if not asset:
@@ -545,7 +735,9 @@ class UnrealMoviePublishPlugin(HookBaseClass):
         return version_number
 
     def _unreal_asset_set_version(self, asset_path, version_number):
-        asset = unreal.EditorAssetLibrary.load_asset(asset_path)
+        # The sequence was already loaded by validate(), only load it if it
+        # is not in memory anymore
+        asset = unreal.find_asset(asset_path) or unreal.EditorAssetLibrary.load_asset(asset_path)
 
         if not asset:
             return
@@ -556,11 +748,35 @@ class UnrealMoviePublishPlugin(HookBaseClass):
         unreal.EditorAssetLibrary.set_metadata_tag(asset, tag, str(version_number))
         unreal.EditorAssetLibrary.save_loaded_asset(asset)
 
-
-        engine = sgtk.platform.current_engine()
         for dialog in engine.created_qt_dialogs:
             dialog.raise_()
 
+    def _run_render_process(self, cmd_args, run_env):
+        """
+        Run the given render command and wait for it to complete, writing its
+        output to a log file in the project Saved/Logs folder.
+
+        :param cmd_args: The command line arguments to run.
+        :param run_env: The environment to run the command in.
+        :returns: The return code of the render process.
+        """
+        _, saved_prefix = self._get_project_paths()
+        log_folder = os.path.join(saved_prefix, "Logs")
+        if not os.path.isdir(log_folder):
+            os.makedirs(log_folder)
+        log_path = os.path.join(
+            log_folder,
+            "Publish2Render_%s.log" % datetime.datetime.now().strftime("%Y.%m.%d-%H.%M.%S"),
+        )
+        self.logger.info("Writing the render output to %s", log_path)
+        with open(log_path, "wb") as log_file:
+            return_code = subprocess.call(
+                cmd_args, env=run_env, stdout=log_file, stderr=subprocess.STDOUT
+            )
+        if return_code:
+            self.logger.warning("Render exited with code %s, see %s for details.", return_code, log_path)
+        return return_code
+
     def _unreal_render_sequence_with_sequencer(self, output_path, unreal_map_path, sequence_path):
         if self._render_format == "exr":
             movie_format = "Image"
@@ -577,12 +793,10 @@ class UnrealMoviePublishPlugin(HookBaseClass):
         if not os.path.isfile(editor_cmd_path):
             editor_cmd_path = os.path.join(engine_root, "Binaries", "Win64", "UnrealEditor.exe")
 
+        project_file, _ = self._get_project_paths()
         cmdline_args = [
             editor_cmd_path,
-            "%s" % os.path.join(
-                unreal.SystemLibrary.get_project_directory(),
-                "%s.uproject" % unreal.SystemLibrary.get_game_name(),
-            ),
+            project_file,
             unreal_map_path,
             "-LevelSequence=%s" % sequence_path,
             "-MovieFolder=%s" % output_folder,
@@ -603,17 +817,13 @@ class UnrealMoviePublishPlugin(HookBaseClass):
             "-NoScreenMessages",
         ]
 
-        run_env = copy.copy(os.environ)
-        if "UE_SHOTGUN_BOOTSTRAP" in run_env:
-            del run_env["UE_SHOTGUN_BOOTSTRAP"]
-        if "UE_SHOTGRID_BOOTSTRAP" in run_env:
-            del run_env["UE_SHOTGRID_BOOTSTRAP"]
+        run_env = _get_render_env()
 
-        subprocess.call(cmdline_args, env=run_env)
+        self._run_render_process(cmdline_args, run_env)
 
         pattern = os.path.join(output_folder, movie_name + "*." + extension)
-        files = sorted([f for f in glob.glob(pattern) if os.path.isfile(f)])
-        return (len(files) > 0), output_folder
+        # Only check that something was rendered, stop at the first file found
+        return any(os.path.isfile(f) for f in glob.glob(pattern)), output_folder
 
     def _unreal_render_sequence_with_movie_queue(self, output_path, unreal_map_path, sequence_path, presets=None, shot_name=None):
         # self._render_format에 따라 Movie Render Queue 설정
@@ -660,19 +870,16 @@ class UnrealMoviePublishPlugin(HookBaseClass):
 
         _, manifest_path = unreal.MoviePipelineEditorLibrary.save_queue_to_manifest_file(queue)
         manifest_path = os.path.abspath(manifest_path)
-        manifest_dir, manifest_file = os.path.split(manifest_path)
-        f, new_path = tempfile.mkstemp(suffix=os.path.splitext(manifest_file)[1], dir=manifest_dir)
-        os.close(f)
-        os.replace(manifest_path, new_path)
-        manifest_path = new_path.replace(
-            "%s%s" % (
-                os.path.abspath(
-                    os.path.join(unreal.SystemLibrary.get_project_directory(), "Saved")
-                ),
-                os.path.sep,
-            ),
-            "",
+        # Give the manifest a unique name so concurrent renders don't clash
+        new_path = os.path.join(
+            os.path.dirname(manifest_path), "%s%s" % (uuid.uuid4().hex, os.path.splitext(manifest_path)[1])
         )
+        os.replace(manifest_path, new_path)
+        # The manifest path must be relative to the project's Saved folder
+        project_file, saved_prefix = self._get_project_paths()
+        manifest_path = new_path
+        if manifest_path.startswith(saved_prefix):
+            manifest_path = manifest_path[len(saved_prefix):]
 
         engine_root = unreal.Paths.engine_dir()
         editor_cmd_path = os.path.join(engine_root, "Binaries", "Win64", "UnrealEditor-Cmd.exe")
@@ -681,58 +888,27 @@ class UnrealMoviePublishPlugin(HookBaseClass):
 
         cmd_args = [
             sys.executable, 
-            "%s" % os.path.join(
-                unreal.SystemLibrary.get_project_directory(),
-                "%s.uproject" % unreal.SystemLibrary.get_game_name(),
-            ),
-            "MoviePipelineEntryMap?game=/Script/MovieRenderPipelineCore.MoviePipelineGameMode",
-            "-game",
-            "-Multiprocess",
-            "-NoLoadingScreen",
-            "-NoSplash",
-            "-Renderoffscreen",
-            "-FixedSeed",
-            "-log",
-            "-Unattended",
-            "-messaging",
-            '-SessionName="Publish2 Movie Render"',
-            "-nohmd",
-            "-ResX=1280",
-            "-ResY=720",
-            "-dpcvars=%s" % ",".join([
-                "sg.ViewDistanceQuality=4",
-                "sg.AntiAliasingQuality=4",
-                "sg.ShadowQuality=4",
-                "sg.PostProcessQuality=4",
-                "sg.TextureQuality=4",
-                "sg.EffectsQuality=4",
-                "sg.FoliageQuality=4",
-                "sg.ShadingQuality=4",
-                "r.TextureStreaming=0",
-                "r.ForceLOD=0",
-                "r.SkeletalMeshLODBias=-10",
-                "r.ParticleLODBias=-10",
-                "foliage.DitheredLOD=0",
-                "foliage.ForceLOD=0",
-                "r.Shadow.DistanceScale=10",
-                "r.ShadowQuality=5",
-                "r.Shadow.RadiusThreshold=0.001000",
-                "r.ViewDistanceScale=50",
-                "r.D3D12.GPUTimeout=0",
-                "a.URO.Enable=0",
-            ]),
-            "-execcmds=r.HLOD 0",
-            '-MoviePipelineConfig="%s"' % manifest_path,
+            project_file,
         ]
+        cmd_args.extend(_RENDER_QUEUE_ARGS)
+        cmd_args.append('-MoviePipelineConfig="%s"' % manifest_path)
 
-        run_env = copy.copy(os.environ)
-        if "UE_SHOTGUN_BOOTSTRAP" in run_env:
-            del run_env["UE_SHOTGUN_BOOTSTRAP"]
-        if "UE_SHOTGRID_BOOTSTRAP" in run_env:
-            del run_env["UE_SHOTGRID_BOOTSTRAP"]
-        self.logger.info("Running %s" % cmd_args)
-        subprocess.call(cmd_args, env=run_env)
+        run_env = _get_render_env()
+        self.logger.info("Running %s", cmd_args)
+        self._run_render_process(cmd_args, run_env)
 
         pattern = os.path.join(output_folder, movie_name + "_*." + self._render_format)
-        frames = sorted([f for f in glob.glob(pattern) if os.path.isfile(f)])
-        return (len(frames) > 0), output_folder
\ No newline at end of file
+        # Only check that something was rendered, stop at the first file found
+        return any(os.path.isfile(f) for f in glob.glob(pattern)), output_folder
+
+
+def _get_render_env():
+    """
+    Return a copy of the current environment for the render processes,
+    without the Toolkit bootstrap variables.
+
+    :returns: A dictionary of environment variables.
+    """
+    return {
+        key: value for key, value in os.environ.items() if key not in _BOOTSTRAP_ENV_VARS
+    }
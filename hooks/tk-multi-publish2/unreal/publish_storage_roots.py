@@ -0,0 +1,53 @@
+# This file is based on templates provided and copyrighted by Autodesk, Inc.
+# This file has been modified by Epic Games, Inc. and is subject to the license
+# file included in this repository.
+
+import sgtk
+import sys
+import time
+
+# Local storage path field for known Oses.
+_OS_LOCAL_STORAGE_PATH_FIELD = {
+    "darwin": "mac_path",
+    "win32": "windows_path",
+    "linux": "linux_path",
+    "linux2": "linux_path",
+}[sys.platform]
+
+# Shotgun local storages for each site, as (timestamp, storages) pairs, so
+# reopening the publisher doesn't hit the Shotgun server each time.
+_STORAGE_ROOTS_CACHE = {}
+_STORAGE_ROOTS_CACHE_TTL = 300
+
+HookBaseClass = sgtk.get_hook_baseclass()
+class UnrealStorageRootsPublishPlugin(HookBaseClass):
+    """
+    Base plugin for the Unreal publish plugins which let users pick one of the
+    Shotgun local storages as the publish folder.
+
+    This hook should be inserted between the base file publisher hook and the
+    Unreal plugin in the configuration, for example::
+
+        hook: "{self}/publish_file.py:{config}/tk-multi-publish2/unreal/publish_storage_roots.py:{config}/tk-multi-publish2/unreal/publish_asset.py"
+    """
+
+    def _get_storage_roots(self):
+        """
+        Return the Shotgun local storages, only querying them again from the
+        Shotgun server once the cached ones have expired.
+
+        :returns: A list of LocalStorage entity dictionaries.
+        """
+        shotgun = self.parent.shotgun
+        now = time.monotonic()
+        cached = _STORAGE_ROOTS_CACHE.get(shotgun.base_url)
+        if cached and now - cached[0] < _STORAGE_ROOTS_CACHE_TTL:
+            return cached[1]
+
+        storage_roots = shotgun.find(
+            "LocalStorage",
+            [],
+            ["code", _OS_LOCAL_STORAGE_PATH_FIELD]
+        )
+        _STORAGE_ROOTS_CACHE[shotgun.base_url] = (now, storage_roots)
+        return storage_roots